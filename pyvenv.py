@@ -9,21 +9,30 @@ import argparse
 import hashlib
 import importlib.util
 import logging
+import mmap
 import os
-import re
 import shutil
 import sys
-from contextlib import contextmanager
+from functools import lru_cache, partial
 from pathlib import Path
 from subprocess import check_call, CalledProcessError, call, check_output
-from typing import Any
+from typing import Dict
 
-HASH_ALGO = "md5"
+HASH_ALGO = "blake2b"
+HASH_FUNC = (  # pylint: disable=invalid-name
+    getattr(hashlib, HASH_ALGO, None) or partial(hashlib.new, HASH_ALGO)
+)
 CURRENT_PATH = Path(__file__).parent.absolute()
 REQ_TXT = (CURRENT_PATH / "requirements.txt").relative_to(Path.cwd())
 REQ_IN = CURRENT_PATH / "requirements.in"
 WINDOWS = sys.platform.startswith("win")
 LINUX = sys.platform.startswith("linux")
+# (package name, executable name) needed to sync the requirements
+SYNC_EXECUTABLES = (
+    ("pip-tools", "pip-compile"),
+    ("pip-tools", "pip-sync"),
+    ("wheel", "wheel"),
+)
 
 LOG = logging.getLogger("PYVENV")
 
@@ -37,10 +46,10 @@ def save_relative_to(from_path, to_path=None):
     if to_path is None:
         to_path = Path.cwd()
 
-    try:
-        return from_path.relative_to(to_path)
-    except ValueError:
-        return Path(os.path.relpath(from_path, to_path))
+    from_parts, to_parts = from_path.parts, to_path.parts
+    if from_parts[: len(to_parts)] == to_parts:
+        return Path(*from_parts[len(to_parts) :])
+    return Path(os.path.relpath(from_path, to_path))
 
 
 def setup_logging(default_level="WARNING"):
@@ -48,11 +57,15 @@ def setup_logging(default_level="WARNING"):
     LOG.setLevel(logging.getLevelName(default_level))
 
 
-def assert_module(name) -> Any:
-    spec = importlib.util.find_spec(name)  # type: ignore
-    module = spec and spec.loader and importlib.import_module(name)
-    if module:
-        return module
+@lru_cache(maxsize=None)
+def find_module_spec(name):
+    return importlib.util.find_spec(name)  # type: ignore
+
+
+def assert_module(name) -> None:
+    spec = find_module_spec(name)
+    if spec and spec.loader:
+        return
     LOG.error("Cannot load module %s.", name)
     sys.exit(1)
 
@@ -78,10 +91,15 @@ def assert_python_version():
 
 
 def find_executable(name, path):
+    return _find_executable(name, os.fspath(path))
+
+
+@lru_cache(maxsize=None)
+def _find_executable(name, path):
     if WINDOWS:
-        bin_dir = path / "Scripts"
+        bin_dir = Path(path, "Scripts")
     elif LINUX:
-        bin_dir = path / "bin"
+        bin_dir = Path(path, "bin")
     else:
         return None
 
@@ -89,6 +107,10 @@ def find_executable(name, path):
     return exe and Path(exe)
 
 
+def invalidate_executable_cache():
+    _find_executable.cache_clear()
+
+
 def patch_activate(path):
     script = find_executable("activate.bat", path)
     if not script:
@@ -106,25 +128,43 @@ def assert_precommit():
         pass
 
 
-def check_config(path):
+def config_value(path, name):
     config = path / "pyvenv.cfg"
-    if config.exists():
-        mapping = {}
-        for line in config.read_text().splitlines():
-            if "=" not in line:
-                continue
-            key, value = line.split("=", maxsplit=1)
-            mapping[key.strip()] = value.strip()
-        home = mapping.get("home")
-        if home and Path(home).exists():
-            return True
-    return False
+    try:
+        mtime = config.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _config_value(os.fspath(config), mtime, name)
+
+
+@lru_cache(maxsize=None)
+def _config_value(config, _mtime, name):
+    with open(config, encoding="utf-8") as fd:
+        for line in fd:
+            key, sep, value = line.partition("=")
+            if sep and key.strip() == name:
+                return value.strip()
+    return None
+
+
+def check_config(path):
+    home = config_value(path, "home")
+    return bool(home) and Path(home).exists()
+
+
+def python_version(venv_path, python_executable):
+    version = config_value(venv_path, "version")
+    if version:
+        return f"Python {version}"
+    return check_output([str(python_executable), "--version"]).decode().strip()
 
 
 def install_venv(path: Path):
-    venv = assert_module("venv")
+    assert_module("venv")
+    venv = importlib.import_module("venv")
     LOG.info("Installing virtual environment in %s", save_relative_to(path))
     venv.main([str(path)])
+    invalidate_executable_cache()
     patch_activate(path)
 
 
@@ -136,6 +176,21 @@ def venv_python(path):
     return find_executable("python", path)
 
 
+def file_digest(file: Path) -> str:
+    stat = file.stat()
+    return _file_digest(os.fspath(file), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=None)
+def _file_digest(file, _mtime, size):
+    digest = HASH_FUNC()
+    if size:
+        with open(file, "rb") as fd:
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                digest.update(view)
+    return digest.hexdigest()
+
+
 def safe_call(cmd, **kwargs):
     try:
         check_call(cmd, **kwargs)
@@ -144,55 +199,91 @@ def safe_call(cmd, **kwargs):
         sys.exit(exc.returncode)
 
 
-@contextmanager
-def content_check(file: Path, path=None):
-    if file.exists():
-        if path is None:
-            path = file.parent
-        actual_hash = hashlib.new(HASH_ALGO, file.read_bytes()).hexdigest()
-        hash_file = path / ".".join((file.name, sys.platform, HASH_ALGO.lower()))
-        if hash_file.exists():
-            saved_hash = hash_file.read_text()
-        else:
-            saved_hash = None
-
-        yield saved_hash != actual_hash
-        hash_file.write_text(actual_hash)
-    else:
-        yield False
+class content_check:  # pylint: disable=invalid-name
+    """
+    context manager which yields whether the file content changed since the
+    last successful run and records the new hash on exit
+    """
 
+    def __init__(self, file: Path, path=None):
+        self.file = file
+        self.path = file.parent if path is None else path
+        self.actual_hash = None
+
+    def __enter__(self):
+        if not self.file.exists():
+            return False
+        self.actual_hash = file_digest(self.file)
+        hash_file = self.hash_file
+        saved_hash = hash_file.read_text() if hash_file.exists() else None
+        return saved_hash != self.actual_hash
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None and self.actual_hash is not None:
+            self.hash_file.write_text(self.actual_hash)
+        return False
+
+    @property
+    def hash_file(self) -> Path:
+        return self.path / ".".join((self.file.name, sys.platform, HASH_ALGO.lower()))
+
+
+def sync_fingerprint(python_executable: Path):
+    digest = HASH_FUNC()
+    for file in (REQ_IN, REQ_TXT):
+        if not file.exists():
+            return None
+        digest.update(file_digest(file).encode())
+    digest.update(str(python_executable).encode())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()
+
+
+def pip_options():
+    for req_file in (REQ_IN, REQ_TXT):
+        if req_file.exists():
+            return [
+                option
+                for line in req_file.read_text().splitlines()
+                if line.startswith("--")
+                for option in line.split()
+            ]
+    return []
+
+
+def ensure_packages(venv_path: Path, requirements) -> Dict[str, Path]:
+    """
+    install the packages providing the given executables with a single pip call
 
-def package_executable(venv_path: Path, package_name, executable_name):
+    :param requirements: iterable of (package_name, executable_name) tuples
+    :return: mapping of executable names to their paths
+    """
     python_executable = venv_python(venv_path)
-
-    if not find_executable(executable_name, venv_path):
-        LOG.info("installing %s...", package_name)
-        options = []
-
-        for req_file in (REQ_IN, REQ_TXT):
-            if not req_file.exists():
-                continue
-            for option in re.findall(r"^--.*", REQ_IN.read_text(), flags=re.MULTILINE):
-                options.extend(option.split())
-            break
-
+    missing = {
+        package_name: None
+        for package_name, executable_name in requirements
+        if not find_executable(executable_name, venv_path)
+    }
+
+    if missing:
+        LOG.info("installing %s...", ", ".join(missing))
         safe_call(
-            [str(python_executable), "-m", "pip", "install", *options, package_name]
+            [str(python_executable), "-m", "pip", "install", *pip_options(), *missing]
         )
+        invalidate_executable_cache()
 
-    return find_executable(executable_name, venv_path)
+    return {
+        executable_name: find_executable(executable_name, venv_path)
+        for _package_name, executable_name in requirements
+    }
 
 
-def sync(venv_path: Path):
-    python_executable = venv_python(venv_path)
-    assert python_executable, "{} not found".format(python_executable)
+def sync_requirements(venv_path: Path, python_executable: Path):
+    LOG.info(python_version(venv_path, python_executable))
 
-    version_b = check_output([str(python_executable), "--version"])
-    LOG.info(version_b.decode().strip())
-
-    pip_compile = package_executable(venv_path, "pip-tools", "pip-compile")
-    pip_sync = package_executable(venv_path, "pip-tools", "pip-sync")
-    package_executable(venv_path, "wheel", "wheel")
+    executables = ensure_packages(venv_path, SYNC_EXECUTABLES)
+    pip_compile = executables["pip-compile"]
+    pip_sync = executables["pip-sync"]
 
     with content_check(REQ_IN, path=venv_path) as has_changed:
         if not REQ_TXT.exists():
@@ -210,8 +301,29 @@ def sync(venv_path: Path):
     with content_check(REQ_TXT, path=venv_path) as has_changed:
         if has_changed:
             safe_call([str(pip_sync), str(REQ_TXT)], cwd=CURRENT_PATH)
+            invalidate_executable_cache()
             LOG.info("Packages are up to date.")
 
+
+def sync(venv_path: Path):
+    python_executable = venv_python(venv_path)
+    assert python_executable, "{} not found".format(python_executable)
+
+    # skip pip-tools if neither the requirements nor the interpreter changed
+    # and the tools are still installed
+    stamp_file = venv_path / ".".join(("sync", sys.platform, HASH_ALGO.lower()))
+    fingerprint = sync_fingerprint(python_executable)
+    if not (
+        fingerprint
+        and stamp_file.exists()
+        and stamp_file.read_text() == fingerprint
+        and all(find_executable(name, venv_path) for _, name in SYNC_EXECUTABLES)
+    ):
+        sync_requirements(venv_path, python_executable)
+        fingerprint = sync_fingerprint(python_executable)
+        if fingerprint:
+            stamp_file.write_text(fingerprint)
+
     if (
         Path(CURRENT_PATH, ".pre-commit-config.yaml").exists()
         and find_executable("pre-commit", venv_path)
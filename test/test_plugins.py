@@ -4,9 +4,11 @@
 # pylint: disable=protected-access,import-outside-toplevel
 
 import importlib
+import os
 import sys
 import unittest
 from contextlib import redirect_stderr, suppress
+from functools import lru_cache
 from inspect import getclosurevars
 from io import StringIO
 from pathlib import Path
@@ -29,31 +31,73 @@ from ytdlp_plugins.patching import patch_function_globals, SKIP_VT_MODE, patch_c
 ROOT_DIR = Path(__file__).parents[1].absolute()
 TEST_DIR = Path(__file__).parent.absolute()
 
-GLOBALS.initialize()
+
+# the search paths only change with a rescan
+plugin_directories = lru_cache(maxsize=1)(directories)
+
+
+def rescan_plugins():
+    GLOBALS.reset()
+    add_plugins()
+    plugin_directories.cache_clear()
+
+
+def iter_py_files(root: str):
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield entry.path
 
 
 class TestPlugins(unittest.TestCase):
     SAMPLE_PLUGIN_DIR = ROOT_DIR / PACKAGE_NAME
-
-    def test_plugin_directory_structure(self):
-        self.assertTrue(self.SAMPLE_PLUGIN_DIR.joinpath("__init__.py").exists())
-        self.assertTrue(self.SAMPLE_PLUGIN_DIR.joinpath("extractor").is_dir())
-        self.assertFalse(
-            self.SAMPLE_PLUGIN_DIR.joinpath("extractor", "__init__.py").exists()
+    SAMPLE_INIT = SAMPLE_PLUGIN_DIR / "__init__.py"
+    SAMPLE_EXTRACTOR_DIR = SAMPLE_PLUGIN_DIR / "extractor"
+    SAMPLE_EXTRACTOR_INIT = SAMPLE_EXTRACTOR_DIR / "__init__.py"
+    SAMPLE_POSTPROCESSOR_DIR = SAMPLE_PLUGIN_DIR / "postprocessor"
+    SAMPLE_POSTPROCESSOR_INIT = SAMPLE_POSTPROCESSOR_DIR / "__init__.py"
+
+    @classmethod
+    def setUpClass(cls):
+        prefix_len = len(str(cls.SAMPLE_PLUGIN_DIR.parent)) + 1
+        cls.sample_plugin_files = tuple(
+            (file, file[prefix_len:].replace(os.sep, "/"))
+            for file in iter_py_files(str(cls.SAMPLE_PLUGIN_DIR))
         )
-        self.assertTrue(self.SAMPLE_PLUGIN_DIR.joinpath("postprocessor").is_dir())
-        self.assertFalse(
-            self.SAMPLE_PLUGIN_DIR.joinpath("postprocessor", "__init__.py").exists()
+        cls.sample_extractor_modules = (f"{PACKAGE_NAME}.extractor",) + tuple(
+            arcname[: -len(".py")].replace("/", ".")
+            for _file, arcname in cls.sample_plugin_files
+            if arcname.startswith(f"{PACKAGE_NAME}/extractor/")
         )
+        cls.orig_bug_report = yt_dlp.utils.bug_reports_message()
+        # add the wheels before the first scan, so that it covers them as well
+        cls.wheel_paths = frozenset(TEST_DIR.rglob("*.whl"))
+        sys.path.extend(map(str, cls.wheel_paths))
+        GLOBALS.initialize()
+        rescan_plugins()
+        # the error stream is bound on construction, so capture it right away
+        cls.ydl_stderr = StringIO()
+        with SKIP_VT_MODE, redirect_stderr(cls.ydl_stderr):
+            cls.ydl = yt_dlp.YoutubeDL(dict(skip_download=True), auto_init=True)
+
+    def test_plugin_directory_structure(self):
+        self.assertTrue(self.SAMPLE_INIT.exists())
+        self.assertTrue(self.SAMPLE_EXTRACTOR_DIR.is_dir())
+        self.assertFalse(self.SAMPLE_EXTRACTOR_INIT.exists())
+        self.assertTrue(self.SAMPLE_POSTPROCESSOR_DIR.is_dir())
+        self.assertFalse(self.SAMPLE_POSTPROCESSOR_INIT.exists())
 
     def test_directories_containing_plugins(self):
-        plugin_dirs = {Path(path) for path in directories()}
+        plugin_dirs = {Path(path) for path in plugin_directories()}
         self.assertIn(self.SAMPLE_PLUGIN_DIR, plugin_dirs)
 
     def test_extractor_classes(self):
-        for module_name in tuple(sys.modules):
-            if module_name.startswith("ytdlp_plugins.extractor"):
-                del sys.modules[module_name]
+        for module_name in self.sample_extractor_modules:
+            sys.modules.pop(module_name, None)
         plugins_ie = load_plugins(f"{PACKAGE_NAME}.extractor", "IE")
         self.assertIn("ytdlp_plugins.extractor.example", sys.modules.keys())
         self.assertIn("ExamplePluginIE", plugins_ie.keys())
@@ -69,11 +113,7 @@ class TestPlugins(unittest.TestCase):
         self.assertIn("ExamplePluginPP", plugins_pp.keys())
 
     def test_importing_wheel_package(self):
-        wheel_paths = set(TEST_DIR.rglob("*.whl"))
-        sys.path.extend(map(str, wheel_paths))
-
-        GLOBALS.reset()
-        add_plugins()
+        wheel_paths = set(self.wheel_paths)
         for fullname, module in sys.modules.items():
             with suppress(AttributeError):
                 wheel_paths = wheel_paths - set(Path(module.__file__).parents)
@@ -87,14 +127,12 @@ class TestPlugins(unittest.TestCase):
         with TemporaryDirectory() as tmp:
             zipmodule_path = Path(tmp, "plugins.zip")
             with ZipFile(zipmodule_path, mode="w") as zipmodule:
-                for file in self.SAMPLE_PLUGIN_DIR.rglob("*.py"):
-                    zipmodule.write(
-                        file, arcname=file.relative_to(self.SAMPLE_PLUGIN_DIR.parent)
-                    )
+                for file, arcname in self.sample_plugin_files:
+                    with open(file, "rb") as fd:
+                        zipmodule.writestr(arcname, fd.read())
 
             sys.path.append(str(zipmodule_path))  # add zip to search paths
-            GLOBALS.reset()
-            add_plugins()
+            rescan_plugins()
 
             for plugin_type in ("extractor", "postprocessor"):
                 package = importlib.import_module(f"{PACKAGE_NAME}.{plugin_type}")
@@ -104,9 +142,6 @@ class TestPlugins(unittest.TestCase):
                 )
 
     def test_overridden_classes(self):
-        GLOBALS.reset()
-        add_plugins()
-
         overridden_names = set(GLOBALS.OVERRIDDEN.keys())
         self.assertGreaterEqual(len(overridden_names), 2)
         all_names = set(yt_dlp.extractor.__dict__.keys()) | set(
@@ -159,16 +194,13 @@ class TestPlugins(unittest.TestCase):
             f"uses unexpected function {self._path(used_func)!r}",
         )
 
-    @SKIP_VT_MODE
     def test_patched_bug_report_message(self):
-        orig_bug_report = yt_dlp.utils.bug_reports_message()
+        orig_bug_report = self.orig_bug_report
         self.assertIn("yt-dlp", orig_bug_report)
 
-        params = dict(skip_download=True)
-        ydl = yt_dlp.YoutubeDL(params, auto_init=True)
         with self.assertRaises(yt_dlp.utils.DownloadError) as context:
             with patch_context():
-                ydl.download(["failingplugin:hello"])
+                self.ydl.download(["failingplugin:hello"])
 
         exc, obj, _ = context.exception.exc_info
         self.assertEqual(orig_bug_report, yt_dlp.utils.bug_reports_message())
@@ -182,18 +214,16 @@ class TestPlugins(unittest.TestCase):
             "Custom bug report message (IE_BUG_REPORT) is not emitted",
         )
 
-    @SKIP_VT_MODE
     def test_orig_bug_report_message(self):
-        orig_bug_report = yt_dlp.utils.bug_reports_message()
+        orig_bug_report = self.orig_bug_report
         self.assertIn("yt-dlp", orig_bug_report)
-        stderr = StringIO()
+        stderr = self.ydl_stderr
+        stderr.seek(0)
+        stderr.truncate()
 
         with self.assertRaises(yt_dlp.utils.DownloadError) as context:
-            with redirect_stderr(stderr):
-                params = dict(skip_download=True)
-                ydl = yt_dlp.YoutubeDL(params, auto_init=True)
-                with patch_context():
-                    ydl.download(["http://www.vimeo.com/123/123"])
+            with patch_context():
+                self.ydl.download(["http://www.vimeo.com/123/123"])
 
         exc, obj, _ = context.exception.exc_info
         self.assertEqual(orig_bug_report, yt_dlp.utils.bug_reports_message())
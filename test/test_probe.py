@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from ytdlp_plugins import probe
+
+TTL_S = probe.PROBE_CACHE_TTL_S
+
+
+# pylint: disable=too-few-public-methods
+class FakeExtractor:
+    def __init__(self, headers):
+        self.headers = headers
+        self.requested_urls = []
+
+    def _request_webpage(self, request, **_kwargs):
+        self.requested_urls.append(request.full_url)
+        return SimpleNamespace(headers=self.headers) if self.headers else None
+
+    def to_screen(self, *_args, **_kwargs):
+        pass
+
+
+class TestProbeMedia(unittest.TestCase):
+    def setUp(self):
+        probe.GLOBALS.PROBE_CACHE.clear()
+        no_ffprobe = SimpleNamespace(probe_available=False)
+        for name, value in (("FFMPEG", no_ffprobe), ("LAST_METADATA", {})):
+            patcher = patch.object(probe.GLOBALS, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(probe.GLOBALS.PROBE_CACHE.clear)
+
+    def test_result_is_not_cached_by_default(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor({"Content-Type": "video/mp4", "Content-Length": "1"})
+
+        probe.probe_media(ie, url)
+        probe.probe_media(ie, url)
+        self.assertEqual(ie.requested_urls, [url, url])
+        self.assertNotIn(ie, probe.GLOBALS.PROBE_CACHE)
+
+    def test_headprobe_result_is_cached(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor({"Content-Type": "video/mp4", "Content-Length": "1234"})
+
+        formats = probe.probe_media(ie, url, note="first", cache_ttl_s=TTL_S)
+        self.assertEqual(formats, [{"url": url, "ext": "mp4", "filesize": 1234}])
+        formats[0]["format_id"] = "modified"
+
+        formats = probe.probe_media(ie, url, note="second", cache_ttl_s=TTL_S)
+        self.assertNotIn("format_id", formats[0])
+        self.assertEqual(ie.requested_urls, [url])
+
+    def test_cache_distinguishes_options(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor({"Content-Type": "audio/mpeg", "Content-Length": "1"})
+
+        probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        probe.probe_media(ie, url, fatal=True, cache_ttl_s=TTL_S)
+        self.assertEqual(ie.requested_urls, [url, url])
+
+    def test_cache_is_scoped_to_extractor(self):
+        url = "https://example.com/media"
+        headers = {"Content-Type": "video/mp4", "Content-Length": "1"}
+        first_ie, second_ie = FakeExtractor(headers), FakeExtractor(headers)
+
+        probe.probe_media(first_ie, url, cache_ttl_s=TTL_S)
+        probe.probe_media(second_ie, url, cache_ttl_s=TTL_S)
+        self.assertEqual(first_ie.requested_urls, [url])
+        self.assertEqual(second_ie.requested_urls, [url])
+
+    def test_cached_formats_are_not_shared(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor(None)
+        probed = [{"url": url, "filesize": 1, "fragments": []}]
+
+        with patch.object(probe, "headprobe_media", return_value=probed):
+            formats = probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        formats[0]["fragments"].append({"url": url})
+        formats = probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        self.assertEqual(formats[0]["fragments"], [])
+
+    def test_headprobe_hit_keeps_metadata(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor({"Content-Type": "video/mp4", "Content-Length": "1"})
+
+        probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        probe.GLOBALS.LAST_METADATA = {"format": {"filename": "other"}}
+        probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        self.assertEqual(probe.GLOBALS.LAST_METADATA["format"]["filename"], "other")
+
+    def test_ffprobe_hit_restores_metadata(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor(None)
+        metadata = {"format": {"filename": url}}
+
+        def ffprobe_media(*_args, **_kwargs):
+            probe.GLOBALS.LAST_METADATA = metadata
+            return [{"url": url, "filesize": 1}]
+
+        probe.GLOBALS.FFMPEG.probe_available = True
+        with patch.object(probe, "ffprobe_media", side_effect=ffprobe_media) as mock:
+            probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+            metadata["format"]["filename"] = "modified"
+            probe.GLOBALS.LAST_METADATA = {}
+            probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(probe.GLOBALS.LAST_METADATA["format"]["filename"], url)
+
+    def test_cache_entries_expire(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor({"Content-Type": "video/mp4", "Content-Length": "1"})
+
+        probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        expired = time.monotonic() + TTL_S
+        with patch.object(probe.time, "monotonic", return_value=expired):
+            probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        self.assertEqual(ie.requested_urls, [url, url])
+
+    def test_failed_probe_expires_early(self):
+        url = "https://example.com/media"
+        ie = FakeExtractor(None)
+
+        probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        expired = time.monotonic() + probe.PROBE_CACHE_FAILED_TTL_S
+        with patch.object(probe.time, "monotonic", return_value=expired):
+            probe.probe_media(ie, url, cache_ttl_s=TTL_S)
+        self.assertEqual(ie.requested_urls, [url, url])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 
 from __future__ import print_function
 import os
+import subprocess
 import sys
 
 if __name__ == "__main__":
@@ -15,6 +16,5 @@ if __name__ == "__main__":
     if not os.path.exists(python_exe):
         print("ERROR: Could not find %s" % python_exe, file=sys.stderr)
         sys.exit(1)
-    cmd = python_exe + " -m " + " ".join(sys.argv[1:])
-    ret = os.system(cmd)
+    ret = subprocess.call([python_exe, "-m"] + sys.argv[1:])
     sys.exit(ret)
@@ -21,6 +21,7 @@ from yt_dlp.extractor.common import InfoExtractor
 
 __version__ = "2023.01.11"
 PACKAGE_NAME = __name__
+PRIVATE_MODULE_RE = re.compile(r"^(\w+\.)*_")
 
 
 class GLOBALS:
@@ -156,7 +157,7 @@ def load_plugins(fullname, suffix, namespace=None):
         return check_predicate
 
     for finder, module_name, _is_pkg in iter_plugin_modules(fullname):
-        if re.match(r"^(\w+\.)*_", module_name):
+        if PRIVATE_MODULE_RE.match(module_name):
             continue
         try:
             try:
@@ -6,9 +6,10 @@ import re
 import sys
 import warnings
 from contextlib import suppress
+from functools import lru_cache
 from inspect import getfile
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Pattern
 from unittest import TestCase
 
 from yt_dlp.extractor import gen_extractor_classes
@@ -138,7 +139,18 @@ def get_testcases():
         yield from get_class_testcases(cls)
 
 
+@lru_cache(maxsize=None)
+def compiled_regex(pattern: str) -> Pattern:
+    return re.compile(pattern)
+
+
 class DownloadTestcase(TestCase):
+    _COUNT_CHECKS = {
+        "mincount": (operator.ge, "expected at least {} items, but only got {}"),
+        "maxcount": (operator.le, "expected not more than {} items, but got {}"),
+        "count": (operator.eq, "expected exactly {} items, but got {}"),
+    }
+
     def assert_field_is_valid(self, expr: bool, field: str, msg: str) -> None:
         if not expr:
             msg = self._formatMessage(msg, f"Mismatch in field {field!r}")
@@ -208,77 +220,13 @@ class DownloadTestcase(TestCase):
         )
 
     def expect_string(self, got: Any, expected: str, field: str):
-        if expected.startswith("re:"):
-            match_str = expected[len("re:") :]
-            match_rex = re.compile(match_str)
+        prefix, sep, value = expected.partition(":")
+        check_func = self._STRING_CHECKS.get(prefix) if sep else None
 
-            self.assert_field_is_valid(
-                isinstance(got, str),
-                field,
-                f"expected a {str.__name__} object, " f"but got {type(got).__name__}",
-            )
-            self.assert_field_is_valid(
-                bool(match_rex.match(got)),
-                field,
-                f"{got!r} does not match regex r'{match_str}'",
-            )
-        elif expected.startswith("startswith:"):
-            start_str = expected[len("startswith:") :]
-            self.assert_field_is_valid(
-                isinstance(got, str),
-                field,
-                f"expected a {str.__name__} object, " f"but got {type(got).__name__}",
-            )
-            self.assert_field_is_valid(
-                got.startswith(start_str),
-                field,
-                f"{got!r} does not start with {start_str!r}",
-            )
-        elif expected.startswith("contains:"):
-            contains_str = expected[len("contains:") :]
-            self.assert_field_is_valid(
-                isinstance(got, str),
-                field,
-                f"expected a {str.__name__} object, " f"but got {type(got).__name__}",
-            )
-            self.assert_field_is_valid(
-                contains_str in got,
-                field,
-                f"{got!r} does not contain {contains_str!r}",
-            )
-        elif expected.startswith("md5:"):
-            self.assert_field_is_valid(
-                isinstance(got, str),
-                field,
-                f"expected a string object, "
-                f"but got value {got!r} of type {type(got)!r}",
-            )
-            self.expect_field("md5:" + md5(got), expected, field)
-        elif re.match(r"^(?:min|max)?count:\d+", expected):
-            self.assert_field_is_valid(
-                isinstance(got, (list, dict)),
-                field,
-                f"expected a list or a dict, "
-                f"but value is of type {type(got).__name__}",
-            )
-            operation, expected_num = expected.split(":")
-            expected_int = int(expected_num)
-            if operation == "mincount":
-                assert_func = operator.ge
-                msg_tmpl = "expected at least {} items, but only got {}"
-            elif operation == "maxcount":
-                assert_func = operator.le
-                msg_tmpl = "expected not more than {} items, but got {}"
-            elif operation == "count":
-                assert_func = operator.eq
-                msg_tmpl = "expected exactly {} items, but got {}"
-            else:
-                raise Exception("Should not happen")
-            self.assert_field_is_valid(
-                assert_func(len(got), expected_int),
-                field,
-                msg_tmpl.format(expected_int, len(got)),
-            )
+        if sep and prefix in self._COUNT_CHECKS and value.isdigit():
+            self._expect_count(got, value, field, prefix)
+        elif check_func is not None:
+            check_func(self, got, value, field)
         elif len(expected) <= 16:
             self.expect_field(got, expected, field)
         else:
@@ -290,6 +238,67 @@ class DownloadTestcase(TestCase):
                 expected, got, f"Mismatch in field {field!r}, expected {exp_short!r}"
             )
 
+    def _expect_str_type(self, got: Any, field: str):
+        self.assert_field_is_valid(
+            isinstance(got, str),
+            field,
+            f"expected a {str.__name__} object, " f"but got {type(got).__name__}",
+        )
+
+    def _expect_regex(self, got: Any, match_str: str, field: str):
+        self._expect_str_type(got, field)
+        self.assert_field_is_valid(
+            bool(compiled_regex(match_str).match(got)),
+            field,
+            f"{got!r} does not match regex r'{match_str}'",
+        )
+
+    def _expect_startswith(self, got: Any, start_str: str, field: str):
+        self._expect_str_type(got, field)
+        self.assert_field_is_valid(
+            got.startswith(start_str),
+            field,
+            f"{got!r} does not start with {start_str!r}",
+        )
+
+    def _expect_contains(self, got: Any, contains_str: str, field: str):
+        self._expect_str_type(got, field)
+        self.assert_field_is_valid(
+            contains_str in got,
+            field,
+            f"{got!r} does not contain {contains_str!r}",
+        )
+
+    def _expect_md5(self, got: Any, md5_str: str, field: str):
+        self.assert_field_is_valid(
+            isinstance(got, str),
+            field,
+            f"expected a string object, "
+            f"but got value {got!r} of type {type(got)!r}",
+        )
+        self.expect_field(f"md5:{md5(got)}", f"md5:{md5_str}", field)
+
+    _STRING_CHECKS = {
+        "re": _expect_regex,
+        "startswith": _expect_startswith,
+        "contains": _expect_contains,
+        "md5": _expect_md5,
+    }
+
+    def _expect_count(self, got: Any, expected_num: str, field: str, operation: str):
+        self.assert_field_is_valid(
+            isinstance(got, (list, dict)),
+            field,
+            f"expected a list or a dict, but value is of type {type(got).__name__}",
+        )
+        expected_int = int(expected_num)
+        assert_func, msg_tmpl = self._COUNT_CHECKS[operation]
+        self.assert_field_is_valid(
+            assert_func(len(got), expected_int),
+            field,
+            msg_tmpl.format(expected_int, len(got)),
+        )
+
     def expect_dict(self, got_dict, expected_dict: Dict[str, Any]):
         self.assertIsInstance(got_dict, dict)
         for info_field, expected in expected_dict.items():
@@ -1,20 +1,48 @@
+import os
 import re
-from typing import Any, Dict
+import time
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from yt_dlp.postprocessor import FFmpegPostProcessor
 from yt_dlp.utils import (
     HEADRequest,
     YoutubeDLError,
     determine_ext,
+    float_or_none,
     int_or_none,
     traverse_obj,
 )
 
+PROFILE_RE = re.compile(r"Profile\s+(\d+)")
+FRAME_RATE_RE = re.compile(r"(\d+)(?:/(\d+))?")
+CONTENT_TYPE_RE = re.compile(
+    "^(?:audio|video|image)/(?:[a-z]+[-.])*([a-zA-Z1-9]{2,})(?:$|;)"
+)
+# these only change the messages, not the result
+PROBE_CACHE_IGNORED_KWARGS = frozenset(("note", "errnote", "video_id"))
+# suggested cache_ttl_s for media that never changes, e.g. content addressed urls
+PROBE_CACHE_TTL_S = float_or_none(
+    os.environ.get("YTDLP_PROBE_CACHE_TTL"), default=3600.0
+)
+# failed probes are retried sooner
+PROBE_CACHE_FAILED_TTL_S = 60.0
+PROBE_CACHE_MAX_ENTRIES = 4096
+
+# expiry time, probed formats and ffprobe metadata (None for HEAD requests)
+CacheEntry = Tuple[float, List[Dict[str, Any]], Optional[Dict[str, Any]]]
+
 
 # pylint: disable=too-few-public-methods
 class GLOBALS:
     FFMPEG = FFmpegPostProcessor()
     LAST_METADATA: Dict[str, Any] = {}
+    # one cache per extractor instance, which probes with its own
+    # downloader's cookies, proxy and timeout settings
+    PROBE_CACHE: "WeakKeyDictionary[Any, Dict[Tuple[Any, ...], CacheEntry]]" = (
+        WeakKeyDictionary()
+    )
 
 
 def codec_name(info):
@@ -32,7 +60,7 @@ def codec_name(info):
     cname = info.get("codec_name", "none")
     fmt = formats.get(cname, cname)
     profile_name = info.get("profile", "???")
-    match = re.match(r"Profile\s+(\d+)", profile_name)
+    match = PROFILE_RE.match(profile_name)
     if match:
         profile = int(match.group(1))
         level = None
@@ -53,10 +81,13 @@ def codec_name(info):
 
 
 def determine_bitrate(info):
-    for path in ("tags/variant_bitrate", "bit_rate"):
-        bitrate = int_or_none(
-            traverse_obj(info, path.split("/"), expected_type=str), scale=1000
-        )
+    tags = info.get("tags")
+    bitrate = None
+    for value in (
+        tags.get("variant_bitrate") if isinstance(tags, dict) else None,
+        info.get("bit_rate"),
+    ):
+        bitrate = int_or_none(value if isinstance(value, str) else None, scale=1000)
         if bitrate:
             break
     return bitrate
@@ -69,7 +100,7 @@ def parse_streams(metadata):
 
     def fps():
         if "r_frame_rate" in v_stream:
-            match = re.match(r"(\d+)(?:/(\d+))?", v_stream["r_frame_rate"])
+            match = FRAME_RATE_RE.match(v_stream["r_frame_rate"])
             if match:
                 nom, den = match.groups()
                 return round(int(nom) / int(den or 1))
@@ -226,9 +257,7 @@ def headprobe_media(self, media_url, **kwargs):
     }
     if response:
         ctype = response.headers["Content-Type"]
-        match = re.match(
-            "^(?:audio|video|image)/(?:[a-z]+[-.])*([a-zA-Z1-9]{2,})(?:$|;)", ctype
-        )
+        match = CONTENT_TYPE_RE.match(ctype)
         if match and format_info["ext"] == "unknown_video":
             format_info["ext"] = match.group(1).lower()
         format_info["filesize"] = int_or_none(response.headers.get("Content-Length"))
@@ -236,10 +265,62 @@ def headprobe_media(self, media_url, **kwargs):
     return [format_info]
 
 
-def probe_media(self, media_url, failfast=False, **kwargs):
+def probe_succeeded(probed_formats):
+    # ffprobe formats always carry the filesize field,
+    # headprobe only adds it if the request got a response
+    return any("filesize" in format_info for format_info in probed_formats)
+
+
+def _probe_media(self, media_url, failfast=False, **kwargs):
+    """
+    return the probed formats and the ffprobe metadata they are based on
+    """
     if GLOBALS.FFMPEG.probe_available:
         probed_formats = ffprobe_media(self, media_url, **kwargs)
         if probed_formats or failfast:
-            return probed_formats
+            return probed_formats, GLOBALS.LAST_METADATA
+
+    return headprobe_media(self, media_url, **kwargs), None
+
+
+def probe_media(self, media_url, failfast=False, cache_ttl_s=None, **kwargs):
+    """
+    probe the media url with ffprobe or a HEAD request
+
+    with cache_ttl_s, results are cached per extractor, url and options
+    for that many seconds (failed ones for at most PROBE_CACHE_FAILED_TTL_S),
+    so that the same media is only probed once
+    """
+    if cache_ttl_s is None:
+        probed_formats, _metadata = _probe_media(
+            self, media_url, failfast=failfast, **kwargs
+        )
+        return probed_formats
+
+    options = sorted(
+        (key, value)
+        for key, value in kwargs.items()
+        if key not in PROBE_CACHE_IGNORED_KWARGS
+    )
+    cache = GLOBALS.PROBE_CACHE.setdefault(self, {})
+    cache_key = (media_url, failfast, repr(options))
+    now = time.monotonic()
+    expires_at, *cached = cache.get(cache_key, (now, None, None))
+    if now < expires_at:
+        probed_formats, metadata = cached
+        if metadata is not None:
+            GLOBALS.LAST_METADATA = deepcopy(metadata)
+    else:
+        cache.pop(cache_key, None)
+        probed_formats, metadata = _probe_media(
+            self, media_url, failfast=failfast, **kwargs
+        )
+        if len(cache) >= PROBE_CACHE_MAX_ENTRIES:
+            # drop the oldest entry
+            del cache[next(iter(cache))]
+        if not probe_succeeded(probed_formats):
+            cache_ttl_s = min(cache_ttl_s, PROBE_CACHE_FAILED_TTL_S)
+        cache[cache_key] = (now + cache_ttl_s, probed_formats, deepcopy(metadata))
 
-    return headprobe_media(self, media_url, **kwargs)
+    # callers usually update the format dicts in place
+    return deepcopy(probed_formats)
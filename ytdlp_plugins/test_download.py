@@ -33,6 +33,7 @@ from .utils import md5
 InfoDict = Dict[str, Any]
 EXC_CODE_STR = "raise exc_cls(msg) from exc"
 EXC_CODE_OBJ = compile(EXC_CODE_STR, "", "exec")
+FIELD_NAME_RE = re.compile(r".*\bfield ['\"]?(\w+)")
 FILE_ERRORS = (
     (FileNotFoundError, WindowsError) if os.name == "nt" else (FileNotFoundError,)
 )
@@ -235,7 +236,7 @@ class TestExtractor(DownloadTestcase):
         with suppress(TypeError, IndexError, KeyError):
             info = info["playlist"][playlist_idx]
 
-        match = re.match(r".*\bfield ['\"]?(\w+)", msg)
+        match = FIELD_NAME_RE.match(msg)
         for path in (
             ("info_dict", "_lineno", match and match[1]),
             ("_lineno", match and match[1]),
@@ -11,16 +11,21 @@ from typing import Dict, Optional, Union
 from urllib.parse import parse_qsl, urlparse
 
 
+FILESIZE_KEYS = ("filesize", "filesize_approx", "fs_approx")
+
+
 def estimate_filesize(formats, duration):
     if not (formats and duration):
         return
 
+    # tbr is given in kbit/s: 1024 bits / 8 = 128 bytes per second and kbit
+    scale = 128 * duration
     for item in formats:
-        if any(map(item.get, ("filesize", "filesize_approx", "fs_approx"))):
+        if any(map(item.get, FILESIZE_KEYS)):
             continue
         tbr = item.get("tbr")
         if tbr:
-            item["filesize_approx"] = 128 * tbr * duration
+            item["filesize_approx"] = scale * tbr
 
 
 def unlazify(cls: type) -> type: